@@ -4,32 +4,49 @@ Simple Python WebSocket client example
 """
 
 import asyncio
-import websockets
-import json
+import socket
+from websockets.asyncio.client import connect
+import orjson
+
+try:
+    # uvloop is an optional, faster drop-in event loop (not available on Windows)
+    import uvloop
+    _run = uvloop.run
+except ImportError:
+    _run = asyncio.run
 
 async def simple_client():
     uri = "ws://localhost:19765"
     
     try:
-        async with websockets.connect(uri) as websocket:
+        async with connect(uri, compression=None, max_size=64 * 1024, max_queue=8,
+                           write_limit=2**17, ping_interval=None) as websocket:
             print("✅ Connected to WebSocket server")
             
+            # Flush small frames immediately instead of waiting on Nagle's algorithm
+            sock = websocket.transport.get_extra_info("socket")
+            if sock is not None:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                except OSError:
+                    pass
+            
             # Send a simple message
             message = {
                 "type": "greeting",
                 "message": "Hello from simple client!"
             }
             
-            await websocket.send(json.dumps(message))
+            await websocket.send(orjson.dumps(message).decode())
             print(f"📤 Sent: {message}")
             
             # Wait for response
             response = await websocket.recv()
-            data = json.loads(response)
+            data = orjson.loads(response)
             print(f"📥 Received: {data}")
             
     except Exception as e:
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(simple_client())
+    _run(simple_client())
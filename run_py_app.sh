@@ -5,10 +5,10 @@ cd "$(dirname "$0")"
 
 echo "Starting Python WebSocket Client..."
 
-# Check if websockets is installed
-if ! python3 -c "import websockets" &> /dev/null; then
-    echo "Installing websockets dependency..."
-    pip3 install websockets
+# Check if dependencies are installed
+if ! python3 -c "import websockets, orjson" &> /dev/null; then
+    echo "Installing Python dependencies..."
+    pip3 install -r requirements.txt
 fi
 
 # Run the client
@@ -7,14 +7,61 @@ bidirectional communication with JSON message exchange.
 """
 
 import asyncio
+import concurrent.futures
 import websockets
-import json
+from websockets.asyncio.client import connect
+import orjson
 import logging
+import socket
 import sys
 
+try:
+    # uvloop is an optional, faster drop-in event loop (not available on Windows)
+    import uvloop
+    _run = uvloop.run
+except ImportError:
+    _run = asyncio.run
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# Keep library frame logging out of the per-message path
+logging.getLogger("websockets").setLevel(logging.WARNING)
+
+# Connection settings sized for small JSON frames. Keepalive pings are disabled:
+# the server answers pings with an empty pong, which never matches the ping data
+CONNECT_OPTIONS = {
+    'compression': None,
+    'max_size': 64 * 1024,
+    'max_queue': 8,
+    'write_limit': 2**17,
+    'ping_interval': None,
+}
+
+def _to_json(value):
+    """Encode a value as JSON text (the server only accepts text frames)"""
+    return orjson.dumps(value).decode()
+
+TEST_MESSAGES = [
+    {'type': 'greeting', 'message': 'Hello from Python client!'},
+    {'command': 'echo', 'data': 'Test echo message'},
+    {'type': 'ping', 'timestamp': '2025-01-01T00:00:00Z'},
+    {'command': 'status', 'request_id': 'test_001'},
+    {'type': 'json_test', 'data': {'nested': True, 'value': 42}},
+]
+
+# Serialized once at import
+_TEST_PAYLOADS = [_to_json(message) for message in TEST_MESSAGES]
+
+def set_tcp_nodelay(websocket):
+    """Disable Nagle's algorithm so small frames are flushed immediately"""
+    sock = websocket.transport.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        logger.debug("Could not set TCP options: %s", e)
 
 class BerlWebSocketClient:
     def __init__(self, host='localhost', port=19765):
@@ -22,6 +69,19 @@ class BerlWebSocketClient:
         self.port = port
         self.websocket = None
         self.running = False
+        # Outbound messages are queued and written by a single writer task
+        self._out_q = asyncio.Queue(maxsize=1024)
+        self._writer_task = None
+        # Set by the listener whenever a message arrives from the server
+        self._response_event = asyncio.Event()
+        
+    async def __aenter__(self):
+        if not await self.connect():
+            raise ConnectionError(f"Could not connect to ws://{self.host}:{self.port}")
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
         
     async def connect(self):
         """Connect to the WebSocket server"""
@@ -29,8 +89,10 @@ class BerlWebSocketClient:
         logger.info(f"Connecting to {uri}")
         
         try:
-            self.websocket = await websockets.connect(uri)
+            self.websocket = await connect(uri, **CONNECT_OPTIONS)
+            set_tcp_nodelay(self.websocket)
             self.running = True
+            self._writer_task = asyncio.create_task(self._writer())
             logger.info("Connected to WebSocket server")
             return True
         except Exception as e:
@@ -41,59 +103,98 @@ class BerlWebSocketClient:
         """Disconnect from the WebSocket server"""
         if self.websocket:
             self.running = False
+            if self._writer_task:
+                # Let already queued messages reach the server before closing,
+                # bounded like the close handshake in case the peer stops reading
+                if not self._writer_task.done():
+                    try:
+                        await asyncio.wait_for(self._out_q.join(), self.websocket.close_timeout)
+                    except asyncio.TimeoutError:
+                        logger.warning("Timed out sending queued messages")
+                self._writer_task.cancel()
+                self._writer_task = None
+                
+            # Don't carry unsent messages over to a later connection
+            dropped = 0
+            while not self._out_q.empty():
+                self._out_q.get_nowait()
+                self._out_q.task_done()
+                dropped += 1
+            if dropped:
+                logger.error("Failed to send %d queued message(s)", dropped)
+                
             await self.websocket.close()
+            self.websocket = None
             logger.info("Disconnected from WebSocket server")
             
-    async def send_message(self, message):
-        """Send a message to the server"""
-        if not self.websocket:
+    async def send_text(self, payload):
+        """Queue an already encoded JSON payload for sending to the server"""
+        if not self.running:
             logger.error("Not connected to server")
             return
             
-        try:
-            if isinstance(message, dict):
-                message_str = json.dumps(message)
-            else:
-                message_str = str(message)
-                
-            await self.websocket.send(message_str)
-            logger.info(f"Sent: {message}")
-        except Exception as e:
-            logger.error(f"Failed to send message: {e}")
+        await self._out_q.put(payload)
+        
+    async def send_json(self, message):
+        """Encode a message as JSON and queue it for sending to the server"""
+        await self.send_text(_to_json(message))
+        
+    async def _writer(self):
+        """Write queued messages to the socket, one text frame each"""
+        while True:
+            message_str = await self._out_q.get()
+            try:
+                await self.websocket.send(message_str)
+                logger.info("Sent: %s", message_str)
+            except Exception as e:
+                logger.error("Failed to send message: %s", e)
+            finally:
+                self._out_q.task_done()
             
     async def listen_for_messages(self):
         """Listen for incoming messages from the server"""
+        if not self.websocket:
+            return
+            
+        # Bind attribute and method lookups once for the receive loop
+        recv = self.websocket.recv
+        loads = orjson.loads
+        handle = self.handle_message
+        response_event = self._response_event
+        log = logger.info
+        
         try:
-            while self.running and self.websocket:
-                message = await self.websocket.recv()
-                logger.info(f"Received: {message}")
+            while self.running:
+                message = await recv()
+                response_event.set()
+                log("Received: %s", message)
                 
                 try:
-                    # Try to parse as JSON
-                    data = json.loads(message)
-                    await self.handle_message(data)
-                except json.JSONDecodeError:
+                    # Try to parse as JSON (ValueError covers orjson and json errors)
+                    data = loads(message)
+                except ValueError:
                     # Handle as plain text
-                    await self.handle_message(message)
+                    data = message
+                await handle(data)
                     
-        except websockets.exceptions.ConnectionClosed:
+        except websockets.ConnectionClosed:
             logger.info("Connection closed by server")
         except Exception as e:
             logger.error(f"Error listening for messages: {e}")
             
     async def handle_message(self, message):
         """Handle incoming messages from the server"""
-        logger.info(f"Processing message: {message}")
+        logger.debug("Processing message: %s", message)
         
         # Example: Echo back with timestamp
         if isinstance(message, dict):
             if message.get('type') == 'ping':
-                await self.send_message({
+                await self.send_json({
                     'type': 'pong',
                     'timestamp': message.get('timestamp')
                 })
             elif message.get('command') == 'echo':
-                await self.send_message({
+                await self.send_json({
                     'type': 'echo_response',
                     'original': message.get('data'),
                     'response': f"Echo: {message.get('data')}"
@@ -101,102 +202,116 @@ class BerlWebSocketClient:
                 
     async def send_test_messages(self):
         """Send a series of test messages"""
-        test_messages = [
-            {'type': 'greeting', 'message': 'Hello from Python client!'},
-            {'command': 'echo', 'data': 'Test echo message'},
-            {'type': 'ping', 'timestamp': '2025-01-01T00:00:00Z'},
-            {'command': 'status', 'request_id': 'test_001'},
-            {'type': 'json_test', 'data': {'nested': True, 'value': 42}},
-        ]
-        
-        for i, message in enumerate(test_messages):
-            logger.info(f"Sending test message {i+1}/{len(test_messages)}")
-            await self.send_message(message)
-            await asyncio.sleep(1)  # Wait 1 second between messages
+        for i, payload in enumerate(_TEST_PAYLOADS):
+            logger.debug("Sending test message %d/%d", i + 1, len(_TEST_PAYLOADS))
+            self._response_event.clear()
+            await self.send_text(payload)
+            
+            # Send the next message as soon as the server answers, waiting
+            # at most 1 second (the server handles one frame per TCP read)
+            try:
+                await asyncio.wait_for(self._response_event.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                logger.warning("No response to test message %d within 1s", i + 1)
             
     async def interactive_mode(self):
         """Interactive mode for manual message sending"""
         logger.info("Interactive mode started. Type messages (JSON format) or 'quit' to exit:")
+        loop = asyncio.get_running_loop()
+        # Blocking input() calls run on their own thread, not the default executor
+        input_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stdin"
+        )
         
-        while self.running:
-            try:
-                user_input = await asyncio.get_event_loop().run_in_executor(
-                    None, input, "Enter message: "
-                )
-                
-                if user_input.lower() in ['quit', 'exit', 'q']:
-                    break
-                    
+        try:
+            while self.running:
                 try:
-                    # Try to parse as JSON
-                    message = json.loads(user_input)
-                except json.JSONDecodeError:
-                    # Send as plain text message
-                    message = {'type': 'text', 'message': user_input}
+                    user_input = await loop.run_in_executor(
+                        input_executor, input, "Enter message: "
+                    )
                     
-                await self.send_message(message)
-                
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                logger.error(f"Error in interactive mode: {e}")
+                    if user_input.lower() in ['quit', 'exit', 'q']:
+                        break
+                        
+                    try:
+                        # Try to parse as JSON
+                        message = orjson.loads(user_input)
+                    except orjson.JSONDecodeError:
+                        # Send as plain text message
+                        message = {'type': 'text', 'message': user_input}
+                        
+                    await self.send_json(message)
+                    
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    logger.error(f"Error in interactive mode: {e}")
+        finally:
+            input_executor.shutdown(wait=False, cancel_futures=True)
                 
-    async def run_demo(self):
-        """Run the demo client"""
+    async def run_with_listener(self, body):
+        """Connect, run body() while listening for messages, then disconnect"""
         if not await self.connect():
             return
             
         try:
-            # Start listening for messages in the background
-            listen_task = asyncio.create_task(self.listen_for_messages())
-            
-            # Send test messages
-            logger.info("Sending test messages...")
-            await self.send_test_messages()
-            
-            # Wait a bit for responses
-            await asyncio.sleep(2)
-            
-            # Start interactive mode
-            await self.interactive_mode()
-            
-        finally:
-            await self.disconnect()
-            listen_task.cancel()
+            async with asyncio.TaskGroup() as tg:
+                # Start listening for messages in the background
+                tg.create_task(self.listen_for_messages())
+                
+                try:
+                    await body()
+                finally:
+                    # Closing the connection ends the listener, so the group can exit
+                    await self.disconnect()
+        except ExceptionGroup as eg:
+            # The listener handles its own errors, so a lone failure comes from
+            # body(); re-raise it unwrapped so callers see the real error
+            if len(eg.exceptions) == 1:
+                raise eg.exceptions[0] from None
+            raise
+                
+    async def demo(self):
+        """Send the test messages, then switch to interactive mode"""
+        logger.info("Sending test messages...")
+        await self.send_test_messages()
+        await self.interactive_mode()
+        
+    async def run_demo(self):
+        """Run the demo client"""
+        await self.run_with_listener(self.demo)
+
+_PARSER = None
+
+def _get_parser():
+    """Build the command line parser on first use (argparse is only imported for the CLI)"""
+    global _PARSER
+    if _PARSER is None:
+        import argparse
+        
+        _PARSER = argparse.ArgumentParser(description='BERL WebSocket Client')
+        _PARSER.add_argument('--host', default='localhost', help='Server host (default: localhost)')
+        _PARSER.add_argument('--port', type=int, default=19765, help='Server port (default: 19765)')
+        _PARSER.add_argument('--mode', choices=['demo', 'test', 'interactive'], default='demo',
+                             help='Client mode (default: demo)')
+    return _PARSER
 
 async def main():
     """Main function"""
-    import argparse
-    
-    parser = argparse.ArgumentParser(description='BERL WebSocket Client')
-    parser.add_argument('--host', default='localhost', help='Server host (default: localhost)')
-    parser.add_argument('--port', type=int, default=19765, help='Server port (default: 19765)')
-    parser.add_argument('--mode', choices=['demo', 'test', 'interactive'], default='demo',
-                       help='Client mode (default: demo)')
-    
-    args = parser.parse_args()
+    args = _get_parser().parse_args()
     
     client = BerlWebSocketClient(args.host, args.port)
     
-    if args.mode == 'demo':
-        await client.run_demo()
-    elif args.mode == 'test':
-        if await client.connect():
-            listen_task = asyncio.create_task(client.listen_for_messages())
-            await client.send_test_messages()
-            await asyncio.sleep(3)
-            await client.disconnect()
-            listen_task.cancel()
-    elif args.mode == 'interactive':
-        if await client.connect():
-            listen_task = asyncio.create_task(client.listen_for_messages())
-            await client.interactive_mode()
-            await client.disconnect()
-            listen_task.cancel()
+    modes = {
+        'demo': client.demo,
+        'test': client.send_test_messages,
+        'interactive': client.interactive_mode,
+    }
+    await client.run_with_listener(modes[args.mode])
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        _run(main())
     except KeyboardInterrupt:
         logger.info("Client stopped by user")
     except Exception as e:
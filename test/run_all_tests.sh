@@ -340,15 +340,13 @@ import asyncio
 
 async def test_with_custom_port():
     from src_py.websocket_client import BerlWebSocketClient
-    client = BerlWebSocketClient(port=$SERVER_PORT)
-    
-    if not await client.connect():
+    try:
+        async with BerlWebSocketClient(port=$SERVER_PORT) as client:
+            # Simple test
+            await client.send_json({'type': 'ping'})
+            await asyncio.sleep(1)
+    except ConnectionError:
         return False
-    
-    # Simple test
-    await client.send_message({'type': 'ping'})
-    await asyncio.sleep(1)
-    await client.disconnect()
     return True
 
 success = asyncio.run(test_with_custom_port())
@@ -3,15 +3,58 @@
 Manual test to debug the integration test.
 """
 import asyncio
-import websockets
-import json
+from websockets.asyncio.client import connect
+import orjson
+import socket
 import sys
 import logging
 
+try:
+    # uvloop is an optional, faster drop-in event loop (not available on Windows)
+    import uvloop
+    _run = uvloop.run
+except ImportError:
+    _run = asyncio.run
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Test cases
+TEST_CASES = [
+    {"type": "greeting", "message": "Hello from automated test"},
+    {"command": "echo", "data": "Test echo message"},
+    {"type": "ping", "timestamp": "2025-01-01T00:00:00Z"},
+    {"command": "status", "request_id": "test_001"},
+    {"type": "json_test", "data": {"nested": True, "value": 42}}
+]
+
+# Serialized once at import; sent as text frames, one per request/response
+_TEST_PAYLOADS = [orjson.dumps(test_case).decode() for test_case in TEST_CASES]
+
+# Error reported for each way waiting on a response can fail
+_RESPONSE_ERRORS = {
+    asyncio.TimeoutError: "Timeout waiting for response to message %d",
+    orjson.JSONDecodeError: "Invalid JSON response to message %d",
+}
+_RESPONSE_ERROR_TYPES = tuple(_RESPONSE_ERRORS)
+
+def response_error_message(error):
+    """Find the message for an error, matching subclasses like the except clause."""
+    for cls in type(error).__mro__:
+        if cls in _RESPONSE_ERRORS:
+            return _RESPONSE_ERRORS[cls]
+
+def set_tcp_nodelay(websocket):
+    """Disable Nagle's algorithm so small frames are flushed immediately."""
+    sock = websocket.transport.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        logger.debug("Could not set TCP options: %s", e)
+
 async def test_websocket_communication():
     """Test WebSocket communication with the Erlang server."""
     try:
@@ -19,32 +62,25 @@ async def test_websocket_communication():
         uri = "ws://localhost:19765"
         logger.info(f"Connecting to {uri}")
         
-        async with websockets.connect(uri) as websocket:
+        async with connect(uri, compression=None, max_size=64 * 1024, max_queue=8,
+                           write_limit=2**17, ping_interval=None) as websocket:
             logger.info("Connected to WebSocket server")
-            
-            # Test cases
-            test_cases = [
-                {"type": "greeting", "message": "Hello from automated test"},
-                {"command": "echo", "data": "Test echo message"},
-                {"type": "ping", "timestamp": "2025-01-01T00:00:00Z"},
-                {"command": "status", "request_id": "test_001"},
-                {"type": "json_test", "data": {"nested": True, "value": 42}}
-            ]
+            set_tcp_nodelay(websocket)
             
             responses_received = 0
             
-            for i, test_case in enumerate(test_cases, 1):
-                logger.info(f"Sending test message {i}/{len(test_cases)}")
+            for i, payload in enumerate(_TEST_PAYLOADS, 1):
+                logger.info("Sending test message %d/%d", i, len(_TEST_PAYLOADS))
                 
                 # Send message
-                await websocket.send(json.dumps(test_case))
-                logger.info(f"Sent: {test_case}")
+                await websocket.send(payload)
+                logger.info("Sent: %s", payload)
                 
                 # Wait for response
                 try:
                     response = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                    response_data = json.loads(response)
-                    logger.info(f"Received: {response_data}")
+                    response_data = orjson.loads(response)
+                    logger.info("Received: %s", response_data)
                     responses_received += 1
                     
                     # Validate response structure
@@ -54,18 +90,12 @@ async def test_websocket_communication():
                     if "timestamp" not in response_data:
                         logger.warning("Response missing timestamp field")
                     
-                except asyncio.TimeoutError:
-                    logger.error(f"Timeout waiting for response to message {i}")
+                except _RESPONSE_ERROR_TYPES as e:
+                    logger.error(response_error_message(e), i)
                     return False
-                except json.JSONDecodeError:
-                    logger.error(f"Invalid JSON response to message {i}")
-                    return False
-                
-                # Small delay between messages
-                await asyncio.sleep(0.5)
             
-            logger.info(f"Test completed: {responses_received}/{len(test_cases)} responses received")
-            return responses_received == len(test_cases)
+            logger.info(f"Test completed: {responses_received}/{len(_TEST_PAYLOADS)} responses received")
+            return responses_received == len(_TEST_PAYLOADS)
             
     except Exception as e:
         logger.error(f"Test failed with exception: {e}")
@@ -74,7 +104,7 @@ async def test_websocket_communication():
 def main():
     """Main test function."""
     try:
-        result = asyncio.run(test_websocket_communication())
+        result = _run(test_websocket_communication())
         if result:
             logger.info("All tests passed!")
             sys.exit(0)